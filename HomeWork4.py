@@ -1,3 +1,16 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+from typing import Iterable, TextIO
+
+DB_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                       'resources', 'documents.sqlite')
+
 documents = [
     {'type': 'passport', 'number': '2207 876234', 'name': 'Василий Гупкин'},
     {'type': 'invoice',  'number': '11-2',        'name': 'Геннадий Покемонов'},
@@ -41,6 +54,174 @@ def handle_command_s() -> None:
     else:
         print("\nРезультат:\nДокумент с таким номером не найден на полках.")
 
+#Хранилище на диске (для пакетного режима)
+class DocumentStore:
+    """Документы и полки в sqlite; соединение открывается при первом запросе."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path)
+        return self._conn
+
+    def get_owner(self, doc_number: str) -> str | None:
+        row = self._connect().execute(
+            "SELECT name FROM documents WHERE number = ?", (doc_number.strip(),)
+        ).fetchone()
+        return row[0] if row else None
+
+    def get_shelf(self, doc_number: str) -> str | None:
+        row = self._connect().execute(
+            "SELECT shelf FROM shelves WHERE number = ?", (doc_number.strip(),)
+        ).fetchone()
+        return row[0] if row else None
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def builtin_hash(docs: list[dict], dirs: dict[str, list[str]]) -> str:
+    data = json.dumps([docs, dirs], ensure_ascii=False)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def build_store(path: str, docs: Iterable[dict], shelves: Iterable[tuple[str, str]],
+                meta: dict[str, str]) -> None:
+    """Собирает хранилище во временном файле и атомарно заменяет им path.
+
+    При повторяющихся номерах побеждает первая запись — как в
+    get_owner_by_number / get_shelf_by_number.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(tmp_path)
+        try:
+            with conn:
+                conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+                conn.execute("CREATE TABLE documents "
+                             "(number TEXT PRIMARY KEY, type TEXT, name TEXT)")
+                conn.execute("CREATE TABLE shelves "
+                             "(number TEXT PRIMARY KEY, shelf TEXT NOT NULL)")
+                conn.executemany(
+                    "INSERT OR IGNORE INTO documents VALUES (?, ?, ?)",
+                    ((str(d['number']).strip(), d.get('type'), d.get('name')) for d in docs),
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO shelves VALUES (?, ?)",
+                    ((str(number).strip(), str(shelf)) for number, shelf in shelves),
+                )
+                conn.executemany("INSERT INTO meta VALUES (?, ?)", meta.items())
+        finally:
+            conn.close()
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_meta(path: str) -> dict[str, str]:
+    conn = sqlite3.connect(path)
+    try:
+        return dict(conn.execute("SELECT key, value FROM meta"))
+    except sqlite3.DatabaseError:
+        raise ValueError(f"{path}: это не хранилище документов "
+                         f"(удалите файл или укажите другой --db)") from None
+    finally:
+        conn.close()
+
+
+def open_store(path: str = DB_FILE) -> DocumentStore:
+    """Открывает хранилище; встроенные данные пересобираются, если изменились."""
+    current = builtin_hash(documents, directories)
+    if os.path.exists(path):
+        meta = read_meta(path)
+        if meta.get('source') != 'builtin' or meta.get('hash') == current:
+            return DocumentStore(path)
+    build_store(
+        path, documents,
+        ((number, shelf) for shelf, numbers in directories.items() for number in numbers),
+        {'source': 'builtin', 'hash': current},
+    )
+    return DocumentStore(path)
+
+
+def import_store(path: str, source_file: str) -> None:
+    """Загружает документы из JSON или CSV в хранилище path.
+
+    JSON: {"documents": [...], "directories": {...}} — как данные выше.
+    CSV: колонки number, type, name, shelf (shelf может быть пустой).
+    """
+    meta = {'source': 'import', 'file': os.path.abspath(source_file)}
+    if source_file.lower().endswith('.json'):
+        with open(source_file, encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or 'documents' not in data:
+            raise ValueError(f"{source_file}: ожидается объект с ключом 'documents'")
+        docs = data['documents']
+        if not isinstance(docs, list) or not all(
+                isinstance(d, dict) and isinstance(d.get('number'), (str, int))
+                and str(d['number']).strip() for d in docs):
+            raise ValueError(f"{source_file}: 'documents' должен быть списком "
+                             f"объектов с непустым полем 'number'")
+        dirs = data.get('directories', {})
+        if not isinstance(dirs, dict) or not all(
+                isinstance(numbers, list) for numbers in dirs.values()):
+            raise ValueError(f"{source_file}: 'directories' должен быть объектом "
+                             f"вида {{полка: [номера]}}")
+        build_store(
+            path, docs,
+            ((number, shelf) for shelf, numbers in dirs.items() for number in numbers),
+            meta,
+        )
+    elif source_file.lower().endswith('.csv'):
+        # Файл читается один раз: полки копятся, пока build_store пишет документы.
+        shelves: list[tuple[str, str]] = []
+
+        def rows():
+            with open(source_file, encoding='utf-8', newline='') as f:
+                reader = csv.DictReader(f)
+                if not reader.fieldnames or 'number' not in reader.fieldnames:
+                    raise ValueError(f"{source_file}: нет колонки 'number'")
+                for row in reader:
+                    if not (row['number'] or '').strip():
+                        raise ValueError(f"{source_file}:{reader.line_num}: "
+                                         f"пустой номер документа")
+                    if row.get('shelf'):
+                        shelves.append((row['number'], row['shelf']))
+                    yield row
+
+        build_store(path, rows(), shelves, meta)
+    else:
+        raise ValueError(f"{source_file}: поддерживаются только .json и .csv")
+
+
+def run_batch(lines: Iterable[str], store: DocumentStore, out: TextIO) -> None:
+    handlers = {'p': store.get_owner, 's': store.get_shelf}
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        cmd, _, doc_number = line.partition(' ')
+        cmd = cmd.lower()
+        doc_number = doc_number.strip()
+        answer = {'cmd': cmd, 'number': doc_number}
+        handler = handlers.get(cmd)
+        if handler is None:
+            answer['error'] = 'unknown command'
+        else:
+            answer['result'] = handler(doc_number)
+        out.write(json.dumps(answer, ensure_ascii=False) + '\n')
+
+
 def main_loop() -> None:
     HELP = (
         "\nДоступные команды:\n"
@@ -64,5 +245,41 @@ def main_loop() -> None:
         else:
             print("Неизвестная команда. Наберите 'h' для помощи.")
 
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Поиск документов и полок")
+    parser.add_argument('--batch', metavar='FILE', nargs='?', const='-',
+                        help="пакетный режим: команды 'p <номер>' / 's <номер>' "
+                             "из файла или stdin ('-'), ответы в JSON lines")
+    parser.add_argument('--db', default=DB_FILE,
+                        help="файл sqlite (по умолчанию собирается из данных выше)")
+    parser.add_argument('--import', dest='import_file', metavar='FILE',
+                        help="загрузить документы в --db из .json или .csv")
+    args = parser.parse_args()
+
+    if args.batch is None and args.import_file is None:
+        main_loop()
+        return
+
+    try:
+        if args.import_file is not None:
+            import_store(args.db, args.import_file)
+            if args.batch is None:
+                return
+            store = DocumentStore(args.db)
+        else:
+            store = open_store(args.db)
+        try:
+            if args.batch == '-':
+                run_batch(sys.stdin, store, sys.stdout)
+            else:
+                with open(args.batch, encoding='utf-8') as f:
+                    run_batch(f, store, sys.stdout)
+        finally:
+            store.close()
+    except KeyError as e:
+        sys.exit(f"Ошибка хранилища: в записи нет поля {e}")
+    except (sqlite3.Error, OSError, ValueError) as e:
+        sys.exit(f"Ошибка хранилища: {e}")
+
 if __name__ == "__main__":
-    main_loop()
+    main()
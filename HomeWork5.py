@@ -1,4 +1,10 @@
-from datetime import datetime
+import argparse
+import re
+import sys
+import timeit
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Callable, Iterable, TextIO
 
 formats = {
     "The Moscow Times": "%A, %B %d, %Y",
@@ -12,10 +18,207 @@ dates = {
     "Daily News": "Thursday, 18 August 1977"
 }
 
-for newspaper, date_str in dates.items():
-    fmt = formats[newspaper]
-    try:
-        parsed = datetime.strptime(date_str, fmt)
-        print(f"{newspaper}: {parsed}")
-    except ValueError:
-        print(f"Ошибка: дата '{date_str}' не соответствует формату '{fmt}'")
\ No newline at end of file
+#Быстрый разбор по заранее скомпилированным форматам
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+          'August', 'September', 'October', 'November', 'December']
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday',
+            'Saturday', 'Sunday']
+
+MONTH_NUMBERS = {name.lower(): i for i, name in enumerate(MONTHS, 1)}
+MONTH_NUMBERS.update({name[:3].lower(): i for i, name in enumerate(MONTHS, 1)})
+
+DIRECTIVES = {
+    'A': r'(?:' + '|'.join(WEEKDAYS) + r')',
+    'a': r'(?:' + '|'.join(d[:3] for d in WEEKDAYS) + r')',
+    'B': r'(?P<month_name>' + '|'.join(MONTHS) + r')',
+    'b': r'(?P<month_name>' + '|'.join(m[:3] for m in MONTHS) + r')',
+    'd': r'(?P<day>3[01]|[12]\d|0?[1-9])',
+    'm': r'(?P<month>1[0-2]|0?[1-9])',
+    'y': r'(?P<year2>\d\d)',
+    'Y': r'(?P<year>\d{4})',
+    'H': r'(?P<hour>2[0-3]|[01]?\d)',
+    'M': r'(?P<minute>[0-5]?\d)',
+    'S': r'(?P<second>[0-5]?\d)',
+    '%': '%',
+}
+
+
+def compile_format(fmt: str) -> Callable[[str], datetime]:
+    """Превращает формат strptime в функцию разбора на одном регулярном выражении.
+
+    Названия месяцев и дней — английские, без зависимости от локали.
+    Как и strptime, пробелы по краям строки не допускаются.
+    Если в формате есть неподдерживаемые директивы, используется strptime.
+    """
+    parts = []
+    i = 0
+    while i < len(fmt):
+        ch = fmt[i]
+        if ch == '%':
+            directive = DIRECTIVES.get(fmt[i + 1]) if i + 1 < len(fmt) else None
+            if directive is None:
+                return lambda date_str: datetime.strptime(date_str, fmt)
+            parts.append(directive)
+            i += 2
+        elif ch.isspace():
+            parts.append(r'\s+')
+            i += 1
+        else:
+            parts.append(re.escape(ch))
+            i += 1
+    pattern = re.compile(''.join(parts), re.IGNORECASE | re.ASCII)
+
+    def parse(date_str: str) -> datetime:
+        match = pattern.fullmatch(date_str)
+        if match is None:
+            raise ValueError(f"time data {date_str!r} does not match format {fmt!r}")
+        g = match.groupdict()
+        if g.get('year'):
+            year = int(g['year'])
+        elif g.get('year2'):
+            year2 = int(g['year2'])
+            year = 2000 + year2 if year2 < 69 else 1900 + year2
+        else:
+            year = 1900
+        if g.get('month_name'):
+            month = MONTH_NUMBERS.get(g['month_name'].lower())
+            if month is None:
+                raise ValueError(f"time data {date_str!r} does not match format {fmt!r}")
+        else:
+            month = int(g.get('month') or 1)
+        return datetime(year, month, int(g.get('day') or 1),
+                        int(g.get('hour') or 0), int(g.get('minute') or 0),
+                        int(g.get('second') or 0))
+
+    return parse
+
+
+class DateParser:
+    """Разбор дат по зарегистрированным форматам с LRU-кэшем результатов.
+
+    Неудачные разборы тоже кэшируются (как текст ошибки), чтобы повторяющаяся
+    плохая строка не прогонялась заново через все форматы.
+    """
+
+    def __init__(self, fmts: dict[str, str] | None = None, cache_size: int = 65536) -> None:
+        self._parsers: dict[str, Callable[[str], datetime]] = {}
+        self._formats: dict[str, str] = {}
+        self._cached_parse = lru_cache(maxsize=cache_size)(self._parse)
+        for source, fmt in (fmts or {}).items():
+            self.register(source, fmt)
+
+    def register(self, source: str, fmt: str) -> None:
+        self._formats[source] = fmt
+        self._parsers[source] = compile_format(fmt)
+        self._cached_parse.cache_clear()
+
+    def _parse(self, date_str: str, source: str | None) -> datetime | str:
+        if source is not None:
+            parser = self._parsers.get(source)
+            if parser is None:
+                return f"неизвестный источник {source!r}"
+            try:
+                return parser(date_str)
+            except ValueError as e:
+                return str(e)
+        for parser in self._parsers.values():
+            try:
+                return parser(date_str)
+            except ValueError:
+                continue
+        return f"дата '{date_str}' не подходит ни к одному формату"
+
+    def parse(self, date_str: str, source: str | None = None) -> datetime:
+        """Разбирает дату; без source формат определяется перебором."""
+        result = self._cached_parse(date_str, source)
+        if isinstance(result, str):
+            raise ValueError(result)
+        return result
+
+    def parse_stream(self, lines: Iterable[str], out: TextIO,
+                     source: str | None = None) -> None:
+        """Пишет в out ISO-дату для каждой строки (или ERROR, если не разобрать)."""
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                out.write(self.parse(line, source).isoformat() + '\n')
+            except ValueError:
+                out.write(f"ERROR\t{line}\n")
+
+
+def benchmark(number: int = 30_000) -> None:
+    """Сравнивает strptime, скомпилированный разбор и кэш.
+
+    Строки — number разных дат подряд с 1970 года, так что кэш здесь
+    почти всегда промахивается; отдельно показан случай одной строки (все попадания).
+    Перед замером результаты сверяются со strptime, в том числе на строках,
+    которые обязаны не разобраться.
+    """
+    start = datetime(1970, 1, 1)
+    for newspaper, fmt in formats.items():
+        fast = compile_format(fmt)
+        samples = [(start + timedelta(days=i)).strftime(fmt) for i in range(number)]
+        for date_str in samples + [dates[newspaper]]:
+            if fast(date_str) != datetime.strptime(date_str, fmt):
+                raise RuntimeError(f"{newspaper}: разбор {date_str!r} расходится со strptime")
+        invalid = [dates[newspaper] + ' ', ' ' + dates[newspaper],
+                   'Friday, 29.02.13', 'Friday, 29 February 2013',
+                   'Friday, February 29, 2013', 'Wednesday, \u017feptember 2, 2002']
+        for date_str in invalid:
+            for name, func in (('compiled', fast),
+                               ('strptime', lambda s: datetime.strptime(s, fmt))):
+                try:
+                    func(date_str)
+                except ValueError:
+                    continue
+                raise RuntimeError(f"{newspaper}: {name} принял неверную строку {date_str!r}")
+
+        t_strptime = timeit.timeit(
+            lambda: [datetime.strptime(s, fmt) for s in samples], number=1)
+        t_compiled = timeit.timeit(lambda: [fast(s) for s in samples], number=1)
+        parser = DateParser(formats)
+        t_cached = timeit.timeit(
+            lambda: [parser.parse(s, newspaper) for s in samples], number=1)
+        date_str = dates[newspaper]
+        t_hits = timeit.timeit(lambda: parser.parse(date_str, newspaper), number=number)
+        print(f"{newspaper}: strptime {t_strptime:.3f}s, compiled {t_compiled:.3f}s, "
+              f"cached (разные строки) {t_cached:.3f}s, "
+              f"cached (одна строка) {t_hits:.3f}s ({number} дат)")
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Разбор дат газет")
+    arg_parser.add_argument('--batch', metavar='FILE', nargs='?', const='-',
+                            help="разобрать даты построчно из файла или stdin ('-')")
+    arg_parser.add_argument('--source', choices=list(formats),
+                            help="газета (формат); без неё формат определяется сам")
+    arg_parser.add_argument('--bench', action='store_true',
+                            help="сравнить скорость со strptime")
+    args = arg_parser.parse_args()
+
+    if args.bench:
+        benchmark()
+        return
+
+    if args.batch is not None:
+        parser = DateParser(formats)
+        if args.batch == '-':
+            parser.parse_stream(sys.stdin, sys.stdout, args.source)
+        else:
+            with open(args.batch, encoding='utf-8') as f:
+                parser.parse_stream(f, sys.stdout, args.source)
+        return
+
+    for newspaper, date_str in dates.items():
+        fmt = formats[newspaper]
+        try:
+            parsed = datetime.strptime(date_str, fmt)
+            print(f"{newspaper}: {parsed}")
+        except ValueError:
+            print(f"Ошибка: дата '{date_str}' не соответствует формату '{fmt}'")
+
+
+if __name__ == "__main__":
+    main()